@@ -0,0 +1,47 @@
+"""0005_jsonb_gin_indexes
+
+Revision ID: 0005_jsonb_gin_indexes
+Revises: 20260314_fix_ins
+Create Date: 2026-10-16
+
+Índices GIN nas colunas JSONB (containment @> / key-existence ?).
+- CREATE INDEX CONCURRENTLY: não bloqueia escritas nas tabelas grandes (fora da transacção do Alembic).
+- Idempotente: IF NOT EXISTS / IF EXISTS.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0005_jsonb_gin_indexes"
+down_revision = "20260314_fix_ins"
+branch_labels = None
+depends_on = None
+
+
+# (nome, tabela, coluna, opclass)
+GIN_INDEXES = [
+    ("ix_risks_uw_kpis_gin", "risks", "uw_kpis", None),
+    ("ix_risks_uw_factors_gin", "risks", "uw_factors", None),
+    ("ix_insurance_policies_raw_payload_gin", "insurance_policies", "raw_payload", "jsonb_path_ops"),
+    ("ix_payments_raw_payload_gin", "payments", "raw_payload", "jsonb_path_ops"),
+    ("ix_claims_raw_payload_gin", "claims", "raw_payload", "jsonb_path_ops"),
+    ("ix_cancellations_raw_payload_gin", "cancellations", "raw_payload", "jsonb_path_ops"),
+    ("ix_fraud_flags_raw_payload_gin", "fraud_flags", "raw_payload", "jsonb_path_ops"),
+    ("ix_source_records_raw_gin", "source_records", "raw", "jsonb_path_ops"),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY não pode correr dentro de uma transacção.
+    with op.get_context().autocommit_block():
+        for name, table, column, opclass in GIN_INDEXES:
+            col_expr = f"{column} {opclass}" if opclass else column
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING gin ({col_expr})")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _table, _column, _opclass in reversed(GIN_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
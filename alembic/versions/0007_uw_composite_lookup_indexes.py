@@ -0,0 +1,64 @@
+"""0007_uw_composite_lookup_indexes
+
+Revision ID: 0007_uw_composite_lookup_indexes
+Revises: 0005_jsonb_gin_indexes
+Create Date: 2026-10-16
+
+Índices compostos de lookup nas tabelas de underwriting, alinhados com as queries reais:
+- (entity_id, subject_bi) / (entity_id, subject_passport) / (entity_id, lower(trim(subject_full_name)))
+  para load_underwriting_by_product (OR entre os três -> BitmapOr);
+- (entity_id, policy_number) parcial (policy_number IS NOT NULL);
+- (entity_id, source_ref) para o DELETE da reimportação.
+Os índices de coluna única em subject_*/product_type/policy_number (0002) deixam de ser
+necessários e são removidos (menos escrita por linha no ingest).
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0007_uw_composite_lookup_indexes"
+down_revision = "0005_jsonb_gin_indexes"
+branch_labels = None
+depends_on = None
+
+
+UW_TABLES = ["insurance_policies", "payments", "claims", "cancellations", "fraud_flags"]
+
+# (sufixo, colunas/expressão, WHERE)
+NEW_INDEXES = [
+    ("entity_subject_bi", "entity_id, subject_bi", None),
+    ("entity_subject_passport", "entity_id, subject_passport", None),
+    ("entity_subject_name_norm", "entity_id, lower(trim(subject_full_name))", None),
+    ("entity_policy_number", "entity_id, policy_number", "policy_number IS NOT NULL"),
+    ("entity_source_ref", "entity_id, source_ref", None),
+]
+
+OLD_INDEXES = ["subject_full_name", "subject_bi", "subject_passport", "product_type", "policy_number"]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY não pode correr dentro de uma transacção.
+    with op.get_context().autocommit_block():
+        for table in UW_TABLES:
+            for suffix, cols, where in NEW_INDEXES:
+                sql = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_{suffix} ON {table} ({cols})"
+                if where:
+                    sql += f" WHERE {where}"
+                op.execute(sql)
+
+        for table in UW_TABLES:
+            for col in OLD_INDEXES:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_{col}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in UW_TABLES:
+            for col in OLD_INDEXES:
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_{col} ON {table} ({col})")
+
+        for table in UW_TABLES:
+            for suffix, _cols, _where in reversed(NEW_INDEXES):
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_{suffix}")
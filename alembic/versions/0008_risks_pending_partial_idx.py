@@ -0,0 +1,32 @@
+"""0008_risks_pending_partial_idx
+
+Revision ID: 0008_risks_pending_partial_idx
+Revises: 0007_uw_composite_lookup_indexes
+Create Date: 2026-10-16
+
+Índice parcial em risks (entity_id, created_at) WHERE status = 'DRAFT':
+o tamanho acompanha só os rascunhos pendentes, não o total de risks.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0008_risks_pending_partial_idx"
+down_revision = "0007_uw_composite_lookup_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_risks_pending "
+            "ON risks (entity_id, created_at) WHERE status = 'DRAFT'"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_risks_pending")
@@ -0,0 +1,31 @@
+"""0009_source_records_server_defaults
+
+Revision ID: 0009_source_records_server_defaults
+Revises: 0008_risks_pending_partial_idx
+Create Date: 2026-10-16
+
+source_records: id e created_at passam a ter DEFAULT na DB (gen_random_uuid() / now()),
+para os INSERTs em lote não terem de gerar/enviar esses valores a partir do Python.
+As restantes tabelas já têm created_at DEFAULT now() desde 0001/0002.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0009_source_records_server_defaults"
+down_revision = "0008_risks_pending_partial_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # gen_random_uuid() é nativo a partir do PostgreSQL 13; em versões antigas vem do pgcrypto.
+    op.execute("ALTER TABLE source_records ALTER COLUMN id SET DEFAULT gen_random_uuid()")
+    op.execute("ALTER TABLE source_records ALTER COLUMN created_at SET DEFAULT now()")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE source_records ALTER COLUMN created_at DROP DEFAULT")
+    op.execute("ALTER TABLE source_records ALTER COLUMN id DROP DEFAULT")
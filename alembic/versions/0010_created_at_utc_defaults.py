@@ -0,0 +1,46 @@
+"""0010_created_at_utc_defaults
+
+Revision ID: 0010_created_at_utc_defaults
+Revises: 0009_source_records_server_defaults
+Create Date: 2026-10-16
+
+created_at passou a ser gerado pela DB (os models já não enviam datetime.utcnow()).
+As colunas são timestamp sem fuso em UTC, mas now() é convertido para o TimeZone da sessão:
+o DEFAULT passa a timezone('utc', now()), para o valor ser UTC independentemente da
+configuração do servidor/role.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0010_created_at_utc_defaults"
+down_revision = "0009_source_records_server_defaults"
+branch_labels = None
+depends_on = None
+
+
+_TABLES = (
+    "entities",
+    "users",
+    "sources",
+    "risks",
+    "audit_logs",
+    "insurance_policies",
+    "payments",
+    "claims",
+    "cancellations",
+    "fraud_flags",
+    "source_records",
+)
+
+
+def upgrade() -> None:
+    for t in _TABLES:
+        op.execute(f"ALTER TABLE {t} ALTER COLUMN created_at SET DEFAULT timezone('utc', now())")
+
+
+def downgrade() -> None:
+    for t in _TABLES:
+        op.execute(f"ALTER TABLE {t} ALTER COLUMN created_at SET DEFAULT now()")
@@ -1,8 +1,9 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from .settings import settings
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+# insertmanyvalues_page_size: executemany de INSERTs (ex.: source_records) vai em lotes multi-VALUES maiores.
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, insertmanyvalues_page_size=10_000)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -13,3 +14,20 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def warm_pool(size: int | None = None) -> None:
+    """Abre `size` conexões em simultâneo (default: pool_size) e devolve-as ao pool.
+
+    Assim o primeiro pedido após o deploy não paga o handshake TCP/TLS/auth ao Postgres.
+    As conexões têm de estar abertas ao mesmo tempo; abrir/fechar em série reutilizaria sempre a mesma.
+    """
+    size = size or engine.pool.size()
+    conns = []
+    try:
+        for _ in range(size):
+            c = engine.connect()
+            conns.append(c)
+            c.execute(text("SELECT 1"))
+    finally:
+        for c in conns:
+            c.close()
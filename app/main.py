@@ -1,9 +1,15 @@
 # app/main.py
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+import warnings
+
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import configure_mappers
 
 from app.settings import settings
 
@@ -19,7 +25,7 @@ from app.routers.diagnostics import router as diagnostics_router
 from app.routers.sources_upload import router as sources_upload_router
 
 import uuid
-from app.db import SessionLocal
+from app.db import SessionLocal, warm_pool
 from app.models import Entity, EntityType, EntityStatus
 
 
@@ -61,18 +67,31 @@ def ensure_sector_entities():
     finally:
         db.close()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Compila já os mappers do ORM (relationships, etc.) em vez de no 1º pedido.
+    configure_mappers()
+
+    # Produção V1: usamos Entities como "Sectors" (tenants) por enquanto.
+    await run_in_threadpool(ensure_sector_entities)
+
+    # Pré-aquece o pool de conexões (best-effort): evita o pico de latência no 1º pedido após deploy.
+    # Falhar aqui não impede o arranque, mas fica visível nos logs (pool mal configurado, DB a recusar conexões).
+    try:
+        await run_in_threadpool(warm_pool)
+    except (SQLAlchemyError, OSError) as e:
+        warnings.warn(f"warm_pool falhou: {type(e).__name__}: {e}", RuntimeWarning, stacklevel=1)
+
+    yield
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title=getattr(settings, "APP_NAME", "Check Insurance Risk API"),
         version=getattr(settings, "APP_VERSION", "1.0.0"),
+        lifespan=lifespan,
     )
 
-    @app.on_event("startup")
-    def _startup():
-        # Produção V1: usamos Entities como "Sectors" (tenants) por enquanto.
-        ensure_sector_entities()
-
-
     # gzip (bom para JSON grandes)
     app.add_middleware(GZipMiddleware, minimum_size=1200)
 
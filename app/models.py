@@ -1,9 +1,8 @@
 from __future__ import annotations
 
 import enum
-from datetime import datetime
 
-from sqlalchemy import Column, String, DateTime, Enum, ForeignKey, JSON, Text, Integer
+from sqlalchemy import Column, String, DateTime, Enum, ForeignKey, JSON, Text, Integer, Index, func, text
 from sqlalchemy.orm import relationship
 
 from .db import Base
@@ -14,6 +13,11 @@ try:
 except Exception:  # pragma: no cover
     JSONB = JSON  # type: ignore
 
+# created_at é gerado na DB (o valor não é enviado pelo Python em cada INSERT e o SQLAlchemy 2.0
+# lê-o de volta via RETURNING). As colunas são DateTime naive em UTC: now() sozinho seguiria o
+# TimeZone da sessão, por isso o default fixa UTC explicitamente (igual à migração 0010).
+_UTC_NOW = text("timezone('utc', now())")
+
 
 class EntityType(str, enum.Enum):
     # NOTE: the existing Postgres enum in production uses "INSURANCE".
@@ -59,7 +63,7 @@ class Entity(Base):
     name = Column(String, nullable=False, unique=True)
     type = Column(Enum(EntityType), nullable=False)
     status = Column(Enum(EntityStatus), nullable=False, default=EntityStatus.ACTIVE)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
 
     users = relationship("User", back_populates="entity")
 
@@ -78,7 +82,7 @@ class User(Base):
     entity_id = Column(String, ForeignKey("entities.id"), nullable=True)
     entity = relationship("Entity", back_populates="users")
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
 
 
 class Source(Base):
@@ -91,7 +95,7 @@ class Source(Base):
     category = Column(String, nullable=False)  # e.g. PEP / SANCTIONS / WATCHLIST / UNDERWRITING
     collected_from = Column(String, nullable=False)  # origem / provider
     status = Column(Enum(SourceStatus), nullable=False, default=SourceStatus.ACTIVE)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
 
 
 class Risk(Base):
@@ -113,7 +117,7 @@ class Risk(Base):
 
     status = Column(Enum(RiskStatus), nullable=False, default=RiskStatus.DRAFT)
     created_by = Column(String, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
 
     # Underwriting (agregado/derivado, opcional)
     uw_score = Column(Integer, nullable=True)
@@ -138,7 +142,7 @@ class AuditLog(Base):
     target_ref = Column(String, nullable=True)
     meta = Column(JSON, nullable=False, default=dict)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
 
 
 # =====================================================================
@@ -151,13 +155,13 @@ class InsurancePolicy(Base):
     id = Column(String, primary_key=True)
     entity_id = Column(String, ForeignKey("entities.id"), nullable=False, index=True)
 
-    subject_full_name = Column(String, nullable=True, index=True)
-    subject_bi = Column(String, nullable=True, index=True)
-    subject_passport = Column(String, nullable=True, index=True)
+    subject_full_name = Column(String, nullable=True)
+    subject_bi = Column(String, nullable=True)
+    subject_passport = Column(String, nullable=True)
 
-    product_type = Column(String, nullable=False, index=True)
+    product_type = Column(String, nullable=False)
 
-    policy_number = Column(String, nullable=True, index=True)
+    policy_number = Column(String, nullable=True)
     insurer_name = Column(String, nullable=True)
     status = Column(String, nullable=True)
     start_date = Column(DateTime, nullable=True)
@@ -171,7 +175,7 @@ class InsurancePolicy(Base):
     source_ref = Column(String, nullable=True)
     raw_payload = Column(JSONB, nullable=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
 
 
 class Payment(Base):
@@ -180,12 +184,12 @@ class Payment(Base):
     id = Column(String, primary_key=True)
     entity_id = Column(String, ForeignKey("entities.id"), nullable=False, index=True)
 
-    subject_full_name = Column(String, nullable=True, index=True)
-    subject_bi = Column(String, nullable=True, index=True)
-    subject_passport = Column(String, nullable=True, index=True)
+    subject_full_name = Column(String, nullable=True)
+    subject_bi = Column(String, nullable=True)
+    subject_passport = Column(String, nullable=True)
 
-    product_type = Column(String, nullable=False, index=True)
-    policy_number = Column(String, nullable=True, index=True)
+    product_type = Column(String, nullable=False)
+    policy_number = Column(String, nullable=True)
 
     amount = Column(Integer, nullable=True)
     currency = Column(String, nullable=True)
@@ -197,7 +201,7 @@ class Payment(Base):
     source_ref = Column(String, nullable=True)
     raw_payload = Column(JSONB, nullable=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
 
 
 class Claim(Base):
@@ -206,12 +210,12 @@ class Claim(Base):
     id = Column(String, primary_key=True)
     entity_id = Column(String, ForeignKey("entities.id"), nullable=False, index=True)
 
-    subject_full_name = Column(String, nullable=True, index=True)
-    subject_bi = Column(String, nullable=True, index=True)
-    subject_passport = Column(String, nullable=True, index=True)
+    subject_full_name = Column(String, nullable=True)
+    subject_bi = Column(String, nullable=True)
+    subject_passport = Column(String, nullable=True)
 
-    product_type = Column(String, nullable=False, index=True)
-    policy_number = Column(String, nullable=True, index=True)
+    product_type = Column(String, nullable=False)
+    policy_number = Column(String, nullable=True)
 
     claim_number = Column(String, nullable=True, index=True)
     loss_date = Column(DateTime, nullable=True)
@@ -226,7 +230,7 @@ class Claim(Base):
     source_ref = Column(String, nullable=True)
     raw_payload = Column(JSONB, nullable=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
 
 
 class Cancellation(Base):
@@ -235,12 +239,12 @@ class Cancellation(Base):
     id = Column(String, primary_key=True)
     entity_id = Column(String, ForeignKey("entities.id"), nullable=False, index=True)
 
-    subject_full_name = Column(String, nullable=True, index=True)
-    subject_bi = Column(String, nullable=True, index=True)
-    subject_passport = Column(String, nullable=True, index=True)
+    subject_full_name = Column(String, nullable=True)
+    subject_bi = Column(String, nullable=True)
+    subject_passport = Column(String, nullable=True)
 
-    product_type = Column(String, nullable=False, index=True)
-    policy_number = Column(String, nullable=True, index=True)
+    product_type = Column(String, nullable=False)
+    policy_number = Column(String, nullable=True)
 
     cancelled_at = Column(DateTime, nullable=True)
     reason = Column(String, nullable=True)
@@ -249,7 +253,7 @@ class Cancellation(Base):
     source_ref = Column(String, nullable=True)
     raw_payload = Column(JSONB, nullable=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
 
 class FraudFlag(Base):
     __tablename__ = "fraud_flags"
@@ -257,12 +261,12 @@ class FraudFlag(Base):
     id = Column(String, primary_key=True)
     entity_id = Column(String, ForeignKey("entities.id"), nullable=False, index=True)
 
-    subject_full_name = Column(String, nullable=True, index=True)
-    subject_bi = Column(String, nullable=True, index=True)
-    subject_passport = Column(String, nullable=True, index=True)
+    subject_full_name = Column(String, nullable=True)
+    subject_bi = Column(String, nullable=True)
+    subject_passport = Column(String, nullable=True)
 
-    product_type = Column(String, nullable=False, index=True)
-    policy_number = Column(String, nullable=True, index=True)
+    product_type = Column(String, nullable=False)
+    policy_number = Column(String, nullable=True)
 
     flag_type = Column(String, nullable=False)
     severity = Column(String, nullable=True)     # LOW/MEDIUM/HIGH
@@ -272,4 +276,54 @@ class FraudFlag(Base):
     source_ref = Column(String, nullable=True)
     raw_payload = Column(JSONB, nullable=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=_UTC_NOW)
+
+
+# =====================================================================
+# Índices GIN (JSONB)
+# =====================================================================
+# raw_payload: só pesquisas por containment (@>) -> jsonb_path_ops (índice mais pequeno e rápido).
+# uw_kpis / uw_factors: também key-existence (?, ?|) -> jsonb_ops (default).
+Index("ix_risks_uw_kpis_gin", Risk.uw_kpis, postgresql_using="gin")
+Index("ix_risks_uw_factors_gin", Risk.uw_factors, postgresql_using="gin")
+
+Index("ix_insurance_policies_raw_payload_gin", InsurancePolicy.raw_payload, postgresql_using="gin", postgresql_ops={"raw_payload": "jsonb_path_ops"})
+Index("ix_payments_raw_payload_gin", Payment.raw_payload, postgresql_using="gin", postgresql_ops={"raw_payload": "jsonb_path_ops"})
+Index("ix_claims_raw_payload_gin", Claim.raw_payload, postgresql_using="gin", postgresql_ops={"raw_payload": "jsonb_path_ops"})
+Index("ix_cancellations_raw_payload_gin", Cancellation.raw_payload, postgresql_using="gin", postgresql_ops={"raw_payload": "jsonb_path_ops"})
+Index("ix_fraud_flags_raw_payload_gin", FraudFlag.raw_payload, postgresql_using="gin", postgresql_ops={"raw_payload": "jsonb_path_ops"})
+
+
+# =====================================================================
+# Índice parcial: fila de risks em DRAFT
+# =====================================================================
+# A maioria das linhas acaba em DONE; o índice só cresce com os rascunhos pendentes.
+Index("ix_risks_pending", Risk.entity_id, Risk.created_at, postgresql_where=text("status = 'DRAFT'"))
+
+
+# =====================================================================
+# Índices compostos de lookup (underwriting)
+# =====================================================================
+# load_underwriting_by_product filtra entity_id = ? AND (bi = ? OR passport = ? OR lower(trim(nome)) = ?):
+# um índice (entity_id, chave) por ramo do OR -> BitmapOr. Substituem os índices de coluna única
+# em subject_*/product_type/policy_number (ver migração 0007).
+def _uw_lookup_indexes(model) -> None:
+    t = model.__tablename__
+    Index(f"ix_{t}_entity_subject_bi", model.entity_id, model.subject_bi)
+    Index(f"ix_{t}_entity_subject_passport", model.entity_id, model.subject_passport)
+    Index(f"ix_{t}_entity_subject_name_norm", model.entity_id, func.lower(func.trim(model.subject_full_name)))
+    Index(
+        f"ix_{t}_entity_policy_number",
+        model.entity_id,
+        model.policy_number,
+        postgresql_where=model.policy_number.isnot(None),
+    )
+    # reimportação: DELETE ... WHERE entity_id = ? AND source_ref = ?
+    Index(f"ix_{t}_entity_source_ref", model.entity_id, model.source_ref)
+
+
+_uw_lookup_indexes(InsurancePolicy)
+_uw_lookup_indexes(Payment)
+_uw_lookup_indexes(Claim)
+_uw_lookup_indexes(Cancellation)
+_uw_lookup_indexes(FraudFlag)
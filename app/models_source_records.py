@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-import uuid
-from datetime import datetime
+from typing import Any, Dict, List
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 
 from app.db import Base
 
@@ -13,7 +12,8 @@ from app.db import Base
 class SourceRecord(Base):
     __tablename__ = "source_records"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Gerados na DB: os INSERTs em lote não enviam id/created_at (gen_random_uuid() é nativo desde o PG 13).
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
 
     entity_id = Column(String, nullable=False, index=True)
 
@@ -33,9 +33,24 @@ class SourceRecord(Base):
 
     raw = Column(JSONB, nullable=False)
 
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=text("timezone('utc', now())"))
 
-    source = relationship("Source", backref="records")
+    # Source.records nunca é lido (os uploads apagam/inserem em bulk): lazy="raise" evita N+1 acidentais,
+    # passive_deletes deixa o ON DELETE CASCADE à DB em vez de carregar a colecção no delete da fonte.
+    source = relationship("Source", backref=backref("records", lazy="raise", passive_deletes=True))
+
+
+def bulk_insert_source_records(db, rows: List[Dict[str, Any]], batch_size: int = 10_000) -> int:
+    """Insere source_records em lote (INSERT multi-VALUES), sem passar pelo unit-of-work do ORM.
+
+    - `db` pode ser Session ou Connection: a transacção (e o commit) fica a cargo de quem chama.
+    - `rows` são dicts simples com as colunas; id/created_at são gerados pela DB se omitidos.
+    - Lotes de `batch_size` linhas limitam a memória por statement.
+    """
+    table = SourceRecord.__table__
+    for i in range(0, len(rows), batch_size):
+        db.execute(table.insert(), rows[i:i + batch_size])
+    return len(rows)
 
 
 Index(
@@ -44,3 +59,11 @@ Index(
     SourceRecord.category,
     SourceRecord.subject_name,
 )
+
+# Pesquisas por containment no payload original (raw @> '{...}').
+Index(
+    "ix_source_records_raw_gin",
+    SourceRecord.raw,
+    postgresql_using="gin",
+    postgresql_ops={"raw": "jsonb_path_ops"},
+)
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from functools import lru_cache
 import hashlib
 import hmac
-from typing import Any, Dict, List, Optional, Tuple
+from io import BytesIO
+from types import SimpleNamespace
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
 
 from app.settings import settings
 
@@ -11,29 +14,84 @@ from app.settings import settings
 # ============================================================
 # Integridade
 # ============================================================
-def make_integrity_hash(risk: Any) -> str:
-    payload = "|".join(
-        [
-            str(getattr(risk, "id", "") or ""),
-            str(getattr(risk, "entity_id", "") or ""),
-            str(getattr(risk, "search_id", "") or ""),
-            str(getattr(risk, "query_name", "") or ""),
-            str(getattr(risk, "query_bi", "") or ""),
-            str(getattr(risk, "query_passport", "") or ""),
-            str(getattr(risk, "query_nationality", "") or ""),
-            str(getattr(risk, "score", "") or ""),
-            str(getattr(risk, "status", "") or ""),
-            str(getattr(risk, "created_at", "") or ""),
-        ]
-    ).encode("utf-8")
-    return hashlib.sha256(payload).hexdigest()
+_INTEGRITY_FIELDS = (
+    "id",
+    "entity_id",
+    "search_id",
+    "query_name",
+    "query_bi",
+    "query_passport",
+    "query_nationality",
+    "score",
+    "status",
+    "created_at",
+)
+
+
+# Algoritmo -> prefixo no hash emitido. SHA-256 fica sem prefixo (formato dos relatórios já emitidos).
+_HASH_PREFIXES = {"sha256": "", "blake2b": "b2:", "blake3": "b3:"}
+
+
+def _integrity_hasher(algo: str) -> Any:
+    if algo == "sha256":
+        return hashlib.sha256()
+    if algo == "blake2b":
+        return hashlib.blake2b(digest_size=32)
+    if algo == "blake3":
+        from blake3 import blake3  # type: ignore  # import tardio: só carregado quando há hashes "b3:"
+
+        return blake3()
+    raise ValueError(f"PDF_HASH_ALGO inválido: {algo!r}")
+
+
+def make_integrity_hash(risk: Any, algo: Optional[str] = None) -> str:
+    # Equivalente a sha256("|".join(campos)), mas sem montar a string intermédia.
+    # A ordem e o formato dos campos não podem mudar: o hash vai no QR dos relatórios já emitidos.
+    algo = algo or settings.PDF_HASH_ALGO
+    h = _integrity_hasher(algo)
+    for i, field in enumerate(_INTEGRITY_FIELDS):
+        if i:
+            h.update(b"|")
+        h.update(str(getattr(risk, field, "") or "").encode("utf-8"))
+    return _HASH_PREFIXES[algo] + h.hexdigest()
+
+
+def verify_integrity_hash(risk: Any, hash_value: str) -> bool:
+    # O algoritmo vem do prefixo do hash recebido, não da configuração actual:
+    # relatórios emitidos antes de mudar PDF_HASH_ALGO continuam a validar.
+    # O hash vem da URL pública: input arbitrário tem de dar False, nunca uma excepção.
+    # Os hashes emitidos são ASCII (prefixo + hex); compare_digest rejeita str não-ASCII com TypeError.
+    if not hash_value.isascii():
+        return False
+    algo = next((a for a, p in _HASH_PREFIXES.items() if p and hash_value.startswith(p)), "sha256")
+    try:
+        expected = make_integrity_hash(risk, algo)
+    except ImportError:
+        # Prefixo de um algoritmo cujo backend não está instalado neste processo.
+        return False
+    return hmac.compare_digest(expected, hash_value)
 
 
-def make_server_signature(integrity_hash: str) -> str:
+@lru_cache(maxsize=1)
+def _signing_key() -> bytes:
+    # Segredo codificado uma vez por processo (as settings não mudam em runtime).
     secret = getattr(settings, "PDF_SIGNING_SECRET", None) or getattr(settings, "JWT_SECRET", "")
     if not secret:
         raise RuntimeError("Falta PDF_SIGNING_SECRET/JWT_SECRET nas definições")
-    return hmac.new(secret.encode("utf-8"), integrity_hash.encode("utf-8"), hashlib.sha256).hexdigest()
+    return secret.encode("utf-8")
+
+
+@lru_cache(maxsize=1)
+def _signing_hmac() -> "hmac.HMAC":
+    # Estado HMAC já com a chave processada (ipad/opad); cada assinatura parte de uma cópia.
+    return hmac.new(_signing_key(), digestmod=hashlib.sha256)
+
+
+def make_server_signature(integrity_hash: str) -> str:
+    # HMAC-SHA256 sobre o hash em hex (formato já emitido; não mudar para digest binário).
+    h = _signing_hmac().copy()
+    h.update(integrity_hash.encode("utf-8"))
+    return h.hexdigest()
 
 
 # ============================================================
@@ -46,19 +104,39 @@ def _safe(v: Any, max_len: int = 240) -> str:
 
 
 def _score_to_int(score: Any) -> int:
+    # Risk.score é String na DB; int() já aceita "72"/" 72 "/"-5" sem passar por str()/isdigit().
+    if type(score) is int:
+        return score
+    if score is None:
+        return 0
     try:
         return int(score)
-    except Exception:
+    except (TypeError, ValueError, OverflowError):
         return 0
 
 
-def _score_band(score: Any) -> Tuple[str, str]:
-    s = _score_to_int(score)
-    if s >= 80:
-        return ("ALTO", "Diligência Reforçada")
-    if s >= 60:
-        return ("MÉDIO", "Revisão Reforçada")
-    return ("BAIXO", "Revisão Padrão")
+_BAND_HIGH = ("ALTO", "Diligência Reforçada")
+_BAND_MEDIUM = ("MÉDIO", "Revisão Reforçada")
+_BAND_LOW = ("BAIXO", "Revisão Padrão")
+
+_YN = {True: "SIM", False: "NÃO"}
+
+# Tabela 0..100 -> (classificação, nível de revisão); fora do intervalo satura nos extremos.
+_SCORE_BANDS: Tuple[Tuple[str, str], ...] = tuple(
+    _BAND_HIGH if s >= 80 else _BAND_MEDIUM if s >= 60 else _BAND_LOW for s in range(101)
+)
+
+
+# Frase fixa de cada faixa na fundamentação da decisão (montada uma vez, não por relatório).
+_BAND_REASONS = {
+    b: f"Nível de risco apurado: {b[0]}. Nível de revisão sugerido: {b[1]}."
+    for b in (_BAND_HIGH, _BAND_MEDIUM, _BAND_LOW)
+}
+
+
+def _score_band(s: int) -> Tuple[str, str]:
+    # Recebe a pontuação já convertida (_score_to_int é chamado uma única vez por relatório).
+    return _SCORE_BANDS[0 if s < 0 else 100 if s > 100 else s]
 
 
 def _normalize_matches_generic(matches: Any) -> Dict[str, Dict[str, List[dict]]]:
@@ -75,27 +153,52 @@ def _normalize_matches_generic(matches: Any) -> Dict[str, Dict[str, List[dict]]]
     if not isinstance(matches, list):
         return out
 
+    bucket_for = out.get
+    watchlist = out["WATCHLIST"]
     for m in matches:
         if not isinstance(m, dict):
             m = {"value": m}
-
-        cat = (m.get("category") or m.get("type") or m.get("list_type") or "WATCHLIST")
-        cat = str(cat).upper().strip()
-        if cat not in out:
-            cat = "WATCHLIST"
-
-        src = (
-            m.get("source")
-            or m.get("source_system")
-            or m.get("provider")
-            or (m.get("sources")[0] if isinstance(m.get("sources"), list) and m.get("sources") else None)
-            or "DESCONHECIDO"
-        )
-        out[cat].setdefault(str(src), []).append(m)
+        get = m.get
+
+        cat = get("category") or get("type") or get("list_type")
+        # Caso comum: a categoria já vem canónica ("PEP", "SANCTIONS", ...) -> um só lookup.
+        bucket = bucket_for(cat) if type(cat) is str else None
+        if bucket is None:
+            bucket = bucket_for(str(cat).upper().strip(), watchlist) if cat else watchlist
+
+        src = get("source") or get("source_system") or get("provider")
+        if not src:
+            srcs = get("sources")
+            src = (srcs[0] if isinstance(srcs, list) and srcs else None) or "DESCONHECIDO"
+        if type(src) is not str:
+            src = str(src)
+
+        hits = bucket.get(src)
+        if hits is None:
+            bucket[src] = [m]
+        else:
+            hits.append(m)
 
     return out
 
 
+def _top_match_score(hits: Any) -> int:
+    # Pontuação máxima de uma fonte; sem try/except por linha no caso comum (int).
+    top = 0
+    for h in hits or []:
+        v = h.get("match_score") if isinstance(h, dict) else None
+        if not v:
+            continue
+        if type(v) is not int:
+            try:
+                v = int(v)
+            except (TypeError, ValueError, OverflowError):
+                continue
+        if v > top:
+            top = v
+    return top
+
+
 def _counts_from_compliance(comp: Dict[str, Dict[str, List[dict]]]) -> Tuple[int, int, int, int]:
     pep = sum(len(v or []) for v in (comp.get("PEP") or {}).values())
     sanc = sum(len(v or []) for v in (comp.get("SANCTIONS") or {}).values())
@@ -104,8 +207,7 @@ def _counts_from_compliance(comp: Dict[str, Dict[str, List[dict]]]) -> Tuple[int
     return pep, sanc, watch, adv
 
 
-def _decision_policy(score: Any, pep_hits: int, sanc_hits: int, fraud_flags: int) -> Tuple[str, List[str]]:
-    band, review_level = _score_band(score)
+def _decision_policy(band: Tuple[str, str], pep_hits: int, sanc_hits: int, fraud_flags: int) -> Tuple[str, List[str]]:
     reasons: List[str] = []
 
     if sanc_hits > 0:
@@ -121,15 +223,17 @@ def _decision_policy(score: Any, pep_hits: int, sanc_hits: int, fraud_flags: int
         decision = "REVISÃO PADRÃO"
         reasons.append("Não foram identificadas correspondências críticas nas fontes configuradas, com base nos dados disponíveis.")
 
-    reasons.append(f"Nível de risco apurado: {band}. Nível de revisão sugerido: {review_level}.")
+    reasons.append(_BAND_REASONS[band])
     reasons.append("Os resultados dependem da completude dos dados fornecidos e das fontes activas e configuradas.")
     reasons.append("As correspondências aproximadas devem ser confirmadas por validação humana antes de qualquer decisão final.")
     return decision, reasons[:5]
 
 
-def _institutional_summary(score: Any, pep: int, sanc: int, watch: int, adv: int, has_uw: bool) -> str:
-    band, review = _score_band(score)
-    s = _score_to_int(score)
+def _institutional_summary(
+    score_i: int, band_review: Tuple[str, str], pep: int, sanc: int, watch: int, adv: int, has_uw: bool
+) -> str:
+    band, review = band_review
+    s = score_i
 
     lines: List[str] = []
     lines.append(f"A avaliação classificou o risco global como {band} (pontuação {s}/100), recomendando {review}.")
@@ -149,110 +253,200 @@ def _institutional_summary(score: Any, pep: int, sanc: int, watch: int, adv: int
     return " ".join(lines)
 
 
+# 1,234,567.89 -> 1 234 567,89 numa só passagem (str.translate em vez de três replace).
+_MONEY_TR = str.maketrans({",": " ", ".": ","})
+
+
+def _fmt_money(v: Any, currency: str | None = None) -> str:
+    try:
+        txt = f"{float(v):,.2f}".translate(_MONEY_TR)
+    except Exception:
+        txt = _safe(v, 40) if v is not None else "N/D"
+    return f"{txt} {currency}".strip() if currency else txt
+
+
+_PAYMENT_STATUS_PT = {
+    "paid": "Pago",
+    "pending": "Pendente",
+    "overdue": "Em atraso",
+    "late": "Em atraso",
+    "unpaid": "Não pago",
+    "cancelled": "Cancelado",
+    "canceled": "Cancelado",
+    "processing": "Em processamento",
+    "failed": "Falhado",
+    "atraso": "Em atraso",
+    "atrasado": "Em atraso",
+    "pago": "Pago",
+    "pendente": "Pendente",
+    "não pago": "Não pago",
+}
+
+
 def _translate_payment_status(v: Any) -> str:
-    s = str(v or "").strip().lower()
-    mapping = {
-        "paid": "Pago",
-        "pending": "Pendente",
-        "overdue": "Em atraso",
-        "late": "Em atraso",
-        "unpaid": "Não pago",
-        "cancelled": "Cancelado",
-        "canceled": "Cancelado",
-        "processing": "Em processamento",
-        "failed": "Falhado",
-        "atraso": "Em atraso",
-        "atrasado": "Em atraso",
-        "pago": "Pago",
-        "pendente": "Pendente",
-        "não pago": "Não pago",
-    }
-    return mapping.get(s, _safe(v, 30) or "N/D")
+    t = _PAYMENT_STATUS_PT.get(str(v or "").strip().lower())
+    return t if t is not None else (_safe(v, 30) or "N/D")
+
+
+_POLICY_STATUS_PT = {
+    "active": "Activa",
+    "ativa": "Activa",
+    "ativo": "Activo",
+    "activa": "Activa",
+    "activo": "Activo",
+    "inactive": "Inactiva",
+    "cancelled": "Cancelada",
+    "canceled": "Cancelada",
+    "expired": "Expirada",
+    "lapsed": "Caducada",
+    "suspended": "Suspensa",
+    "pending": "Pendente",
+    "cancelada": "Cancelada",
+    "expirada": "Expirada",
+    "suspensa": "Suspensa",
+    "pendente": "Pendente",
+}
 
 
 def _translate_policy_status(v: Any) -> str:
-    s = str(v or "").strip().lower()
-    mapping = {
-        "active": "Activa",
-        "ativa": "Activa",
-        "ativo": "Activo",
-        "activa": "Activa",
-        "activo": "Activo",
-        "inactive": "Inactiva",
-        "cancelled": "Cancelada",
-        "canceled": "Cancelada",
-        "expired": "Expirada",
-        "lapsed": "Caducada",
-        "suspended": "Suspensa",
-        "pending": "Pendente",
-        "cancelada": "Cancelada",
-        "expirada": "Expirada",
-        "suspensa": "Suspensa",
-        "pendente": "Pendente",
-    }
-    return mapping.get(s, _safe(v, 30) or "N/D")
+    t = _POLICY_STATUS_PT.get(str(v or "").strip().lower())
+    return t if t is not None else (_safe(v, 30) or "N/D")
+
+
+_CLAIM_STATUS_PT = {
+    "open": "Aberto",
+    "closed": "Encerrado",
+    "rejected": "Recusado",
+    "approved": "Aprovado",
+    "paid": "Pago",
+    "pending": "Pendente",
+    "under_review": "Em análise",
+    "in_review": "Em análise",
+    "aberto": "Aberto",
+    "encerrado": "Encerrado",
+    "recusado": "Recusado",
+    "aprovado": "Aprovado",
+    "pago": "Pago",
+    "pendente": "Pendente",
+}
 
 
 def _translate_claim_status(v: Any) -> str:
-    s = str(v or "").strip().lower()
-    mapping = {
-        "open": "Aberto",
-        "closed": "Encerrado",
-        "rejected": "Recusado",
-        "approved": "Aprovado",
-        "paid": "Pago",
-        "pending": "Pendente",
-        "under_review": "Em análise",
-        "in_review": "Em análise",
-        "aberto": "Aberto",
-        "encerrado": "Encerrado",
-        "recusado": "Recusado",
-        "aprovado": "Aprovado",
-        "pago": "Pago",
-        "pendente": "Pendente",
-    }
-    return mapping.get(s, _safe(v, 30) or "N/D")
+    t = _CLAIM_STATUS_PT.get(str(v or "").strip().lower())
+    return t if t is not None else (_safe(v, 30) or "N/D")
+
+
+# Estados usados nos indicadores do resumo de underwriting (comparados já em minúsculas).
+_ACTIVE_POLICY_STATUSES = frozenset(("active", "ativa", "ativo", "activa", "activo"))
+_CANCELLED_POLICY_STATUSES = frozenset(("cancelled", "canceled", "cancelada", "cancelado"))
+_LATE_PAYMENT_STATUSES = frozenset(("late", "atraso", "atrasado", "overdue", "em atraso"))
+
+
+def _fmt_date(v: Any) -> str:
+    if v is None:
+        return "N/D"
+    s = str(v).replace("T", " ")
+    return s[:10] if len(s) >= 10 else s
+
+
+# Tabelas de underwriting por produto: (chave no pack, título, cabeçalho, larguras em mm, linha).
+# Uma linha por registo (máx. 12), pela ordem em que aparecem no relatório.
+_UW_TABLES: Tuple[Tuple[str, str, Tuple[str, ...], Tuple[float, ...], Any], ...] = (
+    (
+        "policies",
+        "Apólices",
+        ("Apólice", "Seguradora", "Estado", "Início", "Fim", "Prémio"),
+        (26, 42, 24, 24, 24, 30),
+        lambda p: [
+            _safe(p.get("policy_number"), 30),
+            _safe(p.get("insurer_name"), 35),
+            _translate_policy_status(p.get("status")),
+            _fmt_date(p.get("start_date")),
+            _fmt_date(p.get("end_date")),
+            _fmt_money(p.get("premium_amount"), p.get("currency")),
+        ],
+    ),
+    (
+        "payments",
+        "Pagamentos",
+        ("Vencimento", "Pagamento", "Valor", "Estado", "Apólice"),
+        (26, 26, 36, 30, 52),
+        lambda p: [
+            _fmt_date(p.get("due_at")),
+            _fmt_date(p.get("paid_at")),
+            _fmt_money(p.get("amount"), p.get("currency")),
+            _translate_payment_status(p.get("status")),
+            _safe(p.get("policy_number"), 25),
+        ],
+    ),
+    (
+        "claims",
+        "Sinistros",
+        ("Sinistro", "Data", "Estado", "Valor reclamado", "Valor pago"),
+        (28, 24, 28, 45, 45),
+        lambda c: [
+            _safe(c.get("claim_number"), 25),
+            _fmt_date(c.get("loss_date")),
+            _translate_claim_status(c.get("status")),
+            _fmt_money(c.get("amount_claimed"), c.get("currency")),
+            _fmt_money(c.get("amount_paid"), c.get("currency")),
+        ],
+    ),
+    (
+        "cancellations",
+        "Cancelamentos",
+        ("Data", "Motivo"),
+        (28, 142),
+        lambda c: [
+            _fmt_date(c.get("cancelled_at")),
+            _safe(c.get("reason"), 120),
+        ],
+    ),
+    (
+        "fraud_flags",
+        "Fraude ou sinalizações",
+        ("Severidade ou tipo", "Detalhe"),
+        (35, 135),
+        lambda f: [
+            _safe(f.get("severity") or f.get("flag_type"), 30),
+            _safe(f.get("description"), 120),
+        ],
+    ),
+)
 
 
 # ============================================================
-# Construtor do PDF
+# ReportLab (configuração global)
 # ============================================================
-def build_risk_pdf_institutional(
-    risk: Any,
-    analyst_name: str,
-    generated_at: datetime,
-    integrity_hash: str,
-    server_signature: str,
-    verify_url: str,
-    underwriting_by_product: Optional[Dict[str, Any]] = None,
-    compliance_by_category: Optional[Dict[str, Any]] = None,
-    report_title: str = "Relatório Institucional de Avaliação de Risco",
-    report_reference: Optional[str] = None,
-) -> bytes:
-    from io import BytesIO
+@lru_cache(maxsize=1)
+def _configure_reportlab() -> None:
+    """
+    Em produção desliga o shapeChecking e o ASCII85 dos streams binários (+25% de bytes no PDF).
+    O shapeChecking só valida os atributos das shapes de reportlab.graphics (aqui, o Drawing/Path
+    do QR); não tem efeito nos flowables nem no layout Platypus. As shapes deste módulo são
+    construídas com valores fixos, por isso essa validação só precisa de correr em DEBUG.
+    """
+    if getattr(settings, "DEBUG", False):
+        return
+    from reportlab import rl_config
+
+    rl_config.shapeChecking = 0
+    rl_config.useA85 = 0
 
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.units import mm
+
+# ============================================================
+# Tema (cores e estilos)
+# ============================================================
+@lru_cache(maxsize=1)
+def _pdf_theme() -> SimpleNamespace:
+    """
+    Cores e ParagraphStyles do relatório, construídos uma única vez por processo
+    (getSampleStyleSheet cria ~20 estilos). Os estilos são só lidos pelo ReportLab
+    durante o build, por isso podem ser partilhados entre pedidos/threads.
+    """
     from reportlab.lib import colors
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.platypus import (
-        SimpleDocTemplate,
-        Paragraph,
-        Spacer,
-        Table,
-        TableStyle,
-        PageBreak,
-        KeepTogether,
-        Image,
-    )
-
-    try:
-        import qrcode  # type: ignore
-    except Exception:
-        qrcode = None  # type: ignore
-
-    if generated_at.tzinfo is None:
-        generated_at = generated_at.replace(tzinfo=timezone.utc)
+    from reportlab.platypus import TableStyle
 
     styles = getSampleStyleSheet()
 
@@ -265,9 +459,6 @@ def build_risk_pdf_institutional(
     MUTED = colors.HexColor("#667085")
     WHITE = colors.white
 
-    # =========================
-    # Estilos
-    # =========================
     H0 = ParagraphStyle(
         "H0",
         parent=styles["Heading1"],
@@ -345,6 +536,234 @@ def build_risk_pdf_institutional(
         alignment=1,
     )
 
+    # TableStyles constantes: Table.setStyle só lê os comandos, por isso podem ser partilhados.
+    def _grid_style(font_size: float) -> TableStyle:
+        return TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), BRAND),
+                ("TEXTCOLOR", (0, 0), (-1, 0), WHITE),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, 0), font_size),
+                ("TOPPADDING", (0, 0), (-1, 0), 4),
+                ("BOTTOMPADDING", (0, 0), (-1, 0), 4),
+                ("GRID", (0, 0), (-1, -1), 0.25, BORDER),
+                ("FONTSIZE", (0, 1), (-1, -1), font_size),
+                ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
+                ("TEXTCOLOR", (0, 1), (-1, -1), TEXT),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [WHITE, LIGHT]),
+                ("LEFTPADDING", (0, 0), (-1, -1), 4.5),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 4.5),
+                ("TOPPADDING", (0, 1), (-1, -1), 3.2),
+                ("BOTTOMPADDING", (0, 1), (-1, -1), 3.2),
+            ]
+        )
+
+    GRID_STYLES = {7.8: _grid_style(7.8), 7.4: _grid_style(7.4)}
+
+    INFO_BOX_STYLE = TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (-1, 0), SOFT),
+            ("BOX", (0, 0), (-1, -1), 0.35, BORDER),
+            ("INNERGRID", (0, 0), (-1, -1), 0.20, BORDER),
+            ("LEFTPADDING", (0, 0), (-1, -1), 6),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+            ("TOPPADDING", (0, 0), (-1, -1), 4),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+        ]
+    )
+
+    DECISION_BOX_STYLE = TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (-1, -1), BRAND_DARK),
+            ("TEXTCOLOR", (0, 0), (-1, -1), WHITE),
+            ("BOX", (0, 0), (-1, -1), 0.4, BRAND_DARK),
+            ("LEFTPADDING", (0, 0), (-1, -1), 8),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 8),
+            ("TOPPADDING", (0, 0), (-1, -1), 6),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+        ]
+    )
+
+    TWO_COL_STYLE = TableStyle(
+        [
+            ("BACKGROUND", (0, 0), (-1, 0), SOFT),
+            ("BOX", (0, 0), (-1, -1), 0.35, BORDER),
+            ("INNERGRID", (0, 0), (-1, -1), 0.20, BORDER),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ("LEFTPADDING", (0, 0), (-1, -1), 6),
+            ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+            ("TOPPADDING", (0, 0), (-1, -1), 5),
+            ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
+        ]
+    )
+
+    CENTER_STYLE = TableStyle([("ALIGN", (0, 0), (-1, -1), "CENTER")])
+
+    return SimpleNamespace(
+        BRAND=BRAND,
+        BRAND_DARK=BRAND_DARK,
+        LIGHT=LIGHT,
+        SOFT=SOFT,
+        BORDER=BORDER,
+        TEXT=TEXT,
+        MUTED=MUTED,
+        WHITE=WHITE,
+        H0=H0,
+        H1=H1,
+        H2=H2,
+        H3=H3,
+        BODY=BODY,
+        BODY_CENTER=BODY_CENTER,
+        SMALL=SMALL,
+        SMALL_CENTER=SMALL_CENTER,
+        GRID_STYLES=GRID_STYLES,
+        INFO_BOX_STYLE=INFO_BOX_STYLE,
+        DECISION_BOX_STYLE=DECISION_BOX_STYLE,
+        TWO_COL_STYLE=TWO_COL_STYLE,
+        CENTER_STYLE=CENTER_STYLE,
+    )
+
+
+@lru_cache(maxsize=512)
+def _qr_runs(data: str) -> Tuple[int, Tuple[Tuple[int, int, int], ...]]:
+    """
+    Matriz do código QR de verificação como segmentos horizontais de módulos escuros
+    (linha, coluna, comprimento), mais o lado da matriz (com margem).
+    O QR é desenhado em vector no PDF: sem rasterizar com PIL nem embutir um PNG.
+    Correcção L e margem de 2 módulos chegam para os 26 mm impressos.
+    O QRCode é criado por chamada porque o encoder é mutável e os builds correm em
+    threads do threadpool; o resultado é imutável e fica em cache por URL.
+    """
+    import qrcode  # type: ignore
+
+    # mask_pattern fixo: sem ele o qrcode gera e pontua as 8 máscaras (~75% do tempo de encode);
+    # qualquer máscara é válida para os leitores.
+    qr = qrcode.QRCode(
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        border=2,
+        mask_pattern=0,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+
+    runs: List[Tuple[int, int, int]] = []
+    for y, row in enumerate(matrix):
+        x, n = 0, len(row)
+        while x < n:
+            if row[x]:
+                start = x
+                while x < n and row[x]:
+                    x += 1
+                runs.append((y, start, x - start))
+            else:
+                x += 1
+    return len(matrix), tuple(runs)
+
+
+def _qr_drawing(data: str, size: float) -> Any:
+    # Um único Path com um rectângulo por segmento; Drawing novo por build (é um flowable).
+    from reportlab.graphics.shapes import Drawing, Path
+    from reportlab.lib import colors
+
+    n, runs = _qr_runs(data)
+    m = size / n
+    path = Path(fillColor=colors.black, strokeColor=None, strokeWidth=0)
+    for y, x, w in runs:
+        x0, x1 = x * m, (x + w) * m
+        y1 = size - y * m
+        y0 = y1 - m
+        path.moveTo(x0, y1)
+        path.lineTo(x1, y1)
+        path.lineTo(x1, y0)
+        path.lineTo(x0, y0)
+        path.closePath()
+
+    d = Drawing(size, size)
+    d.add(path)
+    return d
+
+
+@lru_cache(maxsize=128)
+def _parsed_para(text: str, style: Any) -> Tuple[Any, list]:
+    from reportlab.platypus import Paragraph
+
+    p = Paragraph(text, style)
+    return p.style, p.frags
+
+
+def _static_para(text: str, style: Any):
+    """
+    Paragraph para texto fixo (títulos, avisos, metodologia): o parse do mini-HTML do ReportLab
+    é feito uma vez e os frags reutilizados. O Paragraph em si é sempre novo, porque wrap/split
+    guardam estado de layout na instância. Não usar com texto que varia por relatório.
+    """
+    from reportlab.platypus import Paragraph
+
+    pstyle, frags = _parsed_para(text, style)
+    return Paragraph(text, pstyle, frags=frags)
+
+
+# ============================================================
+# Construtor do PDF
+# ============================================================
+def write_risk_pdf_institutional(
+    out: BinaryIO,
+    risk: Any,
+    analyst_name: str,
+    generated_at: datetime,
+    integrity_hash: str,
+    server_signature: str,
+    verify_url: str,
+    underwriting_by_product: Optional[Dict[str, Any]] = None,
+    compliance_by_category: Optional[Dict[str, Any]] = None,
+    report_title: str = "Relatório Institucional de Avaliação de Risco",
+    report_reference: Optional[str] = None,
+    include_qr: bool = True,
+    qr_png: Optional[bytes] = None,
+) -> None:
+    """
+    Escreve o relatório directamente em `out` (qualquer ficheiro binário com write()),
+    sem cópia intermédia; quem chama decide se guarda em memória, disco ou resposta HTTP.
+
+    include_qr=False (pré-visualização / reimpressão interna) substitui o QR pelo URL em texto.
+    qr_png: PNG do QR já gerado pelo chamador; evita gerar de novo.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.platypus import (
+        SimpleDocTemplate,
+        Paragraph,
+        Spacer,
+        Table,
+        PageBreak,
+        KeepTogether,
+        Image,
+    )
+
+    try:
+        import qrcode  # type: ignore
+    except Exception:
+        qrcode = None  # type: ignore
+
+    if generated_at.tzinfo is None:
+        generated_at = generated_at.replace(tzinfo=timezone.utc)
+
+    _configure_reportlab()
+    theme = _pdf_theme()
+    BRAND_DARK = theme.BRAND_DARK
+    BORDER = theme.BORDER
+    MUTED = theme.MUTED
+
+    H0 = theme.H0
+    H1 = theme.H1
+    H2 = theme.H2
+    H3 = theme.H3
+    BODY = theme.BODY
+    BODY_CENTER = theme.BODY_CENTER
+    SMALL_CENTER = theme.SMALL_CENTER
+
     # =========================
     # Auxiliares internos
     # =========================
@@ -367,57 +786,25 @@ def build_risk_pdf_institutional(
 
         canvas.restoreState()
 
-    def tbl(data: List[List[Any]], col_widths=None, header_bg=BRAND, font_size=7.8, center=False) -> Table:
+    def tbl(data: List[List[Any]], col_widths=None, font_size=7.8, center=False) -> Table:
         t = Table(data, colWidths=col_widths, hAlign="CENTER" if center else "LEFT")
-        t.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), header_bg),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), WHITE),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, 0), font_size),
-                    ("TOPPADDING", (0, 0), (-1, 0), 4),
-                    ("BOTTOMPADDING", (0, 0), (-1, 0), 4),
-                    ("GRID", (0, 0), (-1, -1), 0.25, BORDER),
-                    ("FONTSIZE", (0, 1), (-1, -1), font_size),
-                    ("FONTNAME", (0, 1), (-1, -1), "Helvetica"),
-                    ("TEXTCOLOR", (0, 1), (-1, -1), TEXT),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [WHITE, LIGHT]),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 4.5),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 4.5),
-                    ("TOPPADDING", (0, 1), (-1, -1), 3.2),
-                    ("BOTTOMPADDING", (0, 1), (-1, -1), 3.2),
-                ]
-            )
-        )
+        t.setStyle(theme.GRID_STYLES[font_size])
         return t
 
     def mini_tbl(data: List[List[Any]], col_widths=None) -> Table:
-        return tbl(data, col_widths=col_widths, header_bg=BRAND, font_size=7.4, center=False)
+        return tbl(data, col_widths=col_widths, font_size=7.4, center=False)
 
-    def info_box(title: str, text: str) -> Table:
+    def info_box(title: str, text: str, static: bool = False) -> Table:
+        para = _static_para if static else Paragraph
         t = Table(
             [
-                [Paragraph(f"<b>{_safe(title, 100)}</b>", BODY)],
-                [Paragraph(_safe(text, 1200), BODY)],
+                [_static_para(f"<b>{_safe(title, 100)}</b>", BODY)],
+                [para(_safe(text, 1200), BODY)],
             ],
             colWidths=[170 * mm],
             hAlign="LEFT",
         )
-        t.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), SOFT),
-                    ("BOX", (0, 0), (-1, -1), 0.35, BORDER),
-                    ("INNERGRID", (0, 0), (-1, -1), 0.20, BORDER),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 6),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-                    ("TOPPADDING", (0, 0), (-1, -1), 4),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-                ]
-            )
-        )
+        t.setStyle(theme.INFO_BOX_STYLE)
         return t
 
     def decision_box(text: str) -> Table:
@@ -426,27 +813,15 @@ def build_risk_pdf_institutional(
             colWidths=[170 * mm],
             hAlign="LEFT",
         )
-        t.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), BRAND_DARK),
-                    ("TEXTCOLOR", (0, 0), (-1, -1), WHITE),
-                    ("BOX", (0, 0), (-1, -1), 0.4, BRAND_DARK),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 8),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 8),
-                    ("TOPPADDING", (0, 0), (-1, -1), 6),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-                ]
-            )
-        )
+        t.setStyle(theme.DECISION_BOX_STYLE)
         return t
 
     def two_col_info(left_title: str, left_html: str, right_title: str, right_html: str) -> Table:
         box = Table(
             [
                 [
-                    Paragraph(f"<b>{_safe(left_title, 80)}</b>", BODY_CENTER),
-                    Paragraph(f"<b>{_safe(right_title, 80)}</b>", BODY_CENTER),
+                    _static_para(f"<b>{_safe(left_title, 80)}</b>", BODY_CENTER),
+                    _static_para(f"<b>{_safe(right_title, 80)}</b>", BODY_CENTER),
                 ],
                 [
                     Paragraph(left_html, BODY),
@@ -456,20 +831,7 @@ def build_risk_pdf_institutional(
             colWidths=[85 * mm, 85 * mm],
             hAlign="LEFT",
         )
-        box.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), SOFT),
-                    ("BOX", (0, 0), (-1, -1), 0.35, BORDER),
-                    ("INNERGRID", (0, 0), (-1, -1), 0.20, BORDER),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 6),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-                    ("TOPPADDING", (0, 0), (-1, -1), 5),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
-                ]
-            )
-        )
+        box.setStyle(theme.TWO_COL_STYLE)
         return box
 
     def _pick(d: dict, *keys: str, default: str = "N/D") -> str:
@@ -485,41 +847,33 @@ def build_risk_pdf_institutional(
     def _pick_int(d: dict, *keys: str, default: int = 0) -> int:
         for k in keys:
             v = d.get(k)
+            if v is None:
+                continue
+            if type(v) is int:
+                return v
             try:
-                if v is None:
-                    continue
                 return int(v)
-            except Exception:
+            except (TypeError, ValueError, OverflowError):
                 continue
         return default
 
-    def _fmt_date(v: Any) -> str:
-        if v is None:
-            return "N/D"
-        s = str(v).replace("T", " ")
-        return s[:10] if len(s) >= 10 else s
-
-    def _fmt_money(v: Any, currency: str | None = None) -> str:
-        try:
-            fv = float(v)
-            txt = f"{fv:,.2f}".replace(",", "X").replace(".", ",").replace("X", " ")
-        except Exception:
-            txt = _safe(v, 40) if v is not None else "N/D"
-        return f"{txt} {currency}".strip() if currency else txt
-
     def _render_source_evidence(src: str, hits: List[dict], max_rows: int = 10) -> List[Any]:
         block: List[Any] = []
         block.append(Paragraph(f"Fonte: <b>{_safe(src, 80)}</b>", H3))
 
         rows = [["#", "Nome ou entidade", "Pontuação", "Referência", "Observação"]]
-        for i, h in enumerate((hits or [])[:max_rows], 1):
-            if not isinstance(h, dict):
-                h = {"value": h}
-            name = _pick(h, "matched_name", "name", "full_name", "entity_name", "value")
-            score = _pick_int(h, "match_score", "score", "similarity", default=0)
-            refid = _pick(h, "list_id", "uid", "external_id", "id", "source_ref", "reference")
-            note = _pick(h, "reason", "note", "description", "details", "summary")
-            rows.append([str(i), _safe(name, 60), str(score), _safe(refid, 40), _safe(note, 100)])
+        rows += [
+            [
+                str(i),
+                _safe(_pick(h, "matched_name", "name", "full_name", "entity_name", "value"), 60),
+                str(_pick_int(h, "match_score", "score", "similarity", default=0)),
+                _safe(_pick(h, "list_id", "uid", "external_id", "id", "source_ref", "reference"), 40),
+                _safe(_pick(h, "reason", "note", "description", "details", "summary"), 100),
+            ]
+            for i, h in enumerate(
+                (h if isinstance(h, dict) else {"value": h} for h in (hits or [])[:max_rows]), 1
+            )
+        ]
 
         block.append(mini_tbl(rows, col_widths=[8 * mm, 55 * mm, 18 * mm, 25 * mm, 64 * mm]))
         block.append(Spacer(1, 3))
@@ -534,17 +888,17 @@ def build_risk_pdf_institutional(
         cancellations = pack.get("cancellations", []) or []
         fraud_flags = pack.get("fraud_flags", []) or []
 
-        active_policies = sum(
-            1 for p in policies
-            if str((p or {}).get("status", "")).lower() in ("active", "ativa", "ativo", "activa", "activo")
-        )
-        cancelled_policies = sum(
-            1 for p in policies
-            if str((p or {}).get("status", "")).lower() in ("cancelled", "canceled", "cancelada", "cancelado")
-        )
+        # Uma só passagem pelas apólices para os dois contadores.
+        active_policies = cancelled_policies = 0
+        for p in policies:
+            st = str((p or {}).get("status", "")).lower()
+            if st in _ACTIVE_POLICY_STATUSES:
+                active_policies += 1
+            elif st in _CANCELLED_POLICY_STATUSES:
+                cancelled_policies += 1
         late_payments = sum(
             1 for p in payments
-            if str((p or {}).get("status", "")).lower() in ("late", "atraso", "atrasado", "overdue", "em atraso")
+            if str((p or {}).get("status", "")).lower() in _LATE_PAYMENT_STATUSES
         )
         total_claims_paid = sum(float((c or {}).get("amount_paid") or 0) for c in claims)
 
@@ -560,76 +914,23 @@ def build_risk_pdf_institutional(
         block.append(tbl(summary_table, col_widths=[42.5 * mm, 42.5 * mm, 42.5 * mm, 42.5 * mm], center=False))
         block.append(Spacer(1, 3))
 
-        if policies:
-            block.append(Paragraph("Apólices", H3))
-            rows = [["Apólice", "Seguradora", "Estado", "Início", "Fim", "Prémio"]]
-            for p in policies[:12]:
-                rows.append([
-                    _safe(p.get("policy_number"), 30),
-                    _safe(p.get("insurer_name"), 35),
-                    _translate_policy_status(p.get("status")),
-                    _fmt_date(p.get("start_date")),
-                    _fmt_date(p.get("end_date")),
-                    _fmt_money(p.get("premium_amount"), p.get("currency")),
-                ])
-            block.append(mini_tbl(rows, col_widths=[26 * mm, 42 * mm, 24 * mm, 24 * mm, 24 * mm, 30 * mm]))
-            block.append(Spacer(1, 2))
-
-        if payments:
-            block.append(Paragraph("Pagamentos", H3))
-            rows = [["Vencimento", "Pagamento", "Valor", "Estado", "Apólice"]]
-            for p in payments[:12]:
-                rows.append([
-                    _fmt_date(p.get("due_at")),
-                    _fmt_date(p.get("paid_at")),
-                    _fmt_money(p.get("amount"), p.get("currency")),
-                    _translate_payment_status(p.get("status")),
-                    _safe(p.get("policy_number"), 25),
-                ])
-            block.append(mini_tbl(rows, col_widths=[26 * mm, 26 * mm, 36 * mm, 30 * mm, 52 * mm]))
-            block.append(Spacer(1, 2))
-
-        if claims:
-            block.append(Paragraph("Sinistros", H3))
-            rows = [["Sinistro", "Data", "Estado", "Valor reclamado", "Valor pago"]]
-            for c in claims[:12]:
-                rows.append([
-                    _safe(c.get("claim_number"), 25),
-                    _fmt_date(c.get("loss_date")),
-                    _translate_claim_status(c.get("status")),
-                    _fmt_money(c.get("amount_claimed"), c.get("currency")),
-                    _fmt_money(c.get("amount_paid"), c.get("currency")),
-                ])
-            block.append(mini_tbl(rows, col_widths=[28 * mm, 24 * mm, 28 * mm, 45 * mm, 45 * mm]))
-            block.append(Spacer(1, 2))
-
-        if cancellations:
-            block.append(Paragraph("Cancelamentos", H3))
-            rows = [["Data", "Motivo"]]
-            for c in cancellations[:12]:
-                rows.append([
-                    _fmt_date(c.get("cancelled_at")),
-                    _safe(c.get("reason"), 120),
-                ])
-            block.append(mini_tbl(rows, col_widths=[28 * mm, 142 * mm]))
-            block.append(Spacer(1, 2))
-
-        if fraud_flags:
-            block.append(Paragraph("Fraude ou sinalizações", H3))
-            rows = [["Severidade ou tipo", "Detalhe"]]
-            for f in fraud_flags[:12]:
-                rows.append([
-                    _safe(f.get("severity") or f.get("flag_type"), 30),
-                    _safe(f.get("description"), 120),
-                ])
-            block.append(mini_tbl(rows, col_widths=[35 * mm, 135 * mm]))
-            block.append(Spacer(1, 2))
+        packs = {"policies": policies, "payments": payments, "claims": claims,
+                 "cancellations": cancellations, "fraud_flags": fraud_flags}
+        for key, title, header, widths_mm, row in _UW_TABLES:
+            items = packs[key]
+            if items:
+                block.append(_static_para(title, H3))
+                rows = [list(header)]
+                rows += [row(it) for it in items[:12]]
+                block.append(mini_tbl(rows, col_widths=[w * mm for w in widths_mm]))
+                block.append(Spacer(1, 2))
 
         if not claims and not cancellations and not fraud_flags:
             block.append(
                 info_box(
                     "Eventos adicionais",
                     "Não foram identificados sinistros, cancelamentos ou sinalizações de fraude associados a este produto.",
+                    static=True,
                 )
             )
             block.append(Spacer(1, 2))
@@ -653,7 +954,8 @@ def build_risk_pdf_institutional(
     # =========================
     score = getattr(risk, "score", None)
     score_i = _score_to_int(score)
-    band, review_level = _score_band(score)
+    band_review = _score_band(score_i)
+    band, review_level = band_review
 
     comp = compliance_by_category or _normalize_matches_generic(getattr(risk, "matches", None) or [])
     pep_count, sanc_count, watch_count, adv_count = _counts_from_compliance(comp)
@@ -665,16 +967,15 @@ def build_risk_pdf_institutional(
     for _pt, pack in (uw or {}).items():
         fraud_flags_count += len((pack or {}).get("fraud_flags", []) or [])
 
-    decision, reasons = _decision_policy(score, pep_count, sanc_count, fraud_flags_count)
-    exec_summary = _institutional_summary(score, pep_count, sanc_count, watch_count, adv_count, has_uw)
+    decision, reasons = _decision_policy(band_review, pep_count, sanc_count, fraud_flags_count)
+    exec_summary = _institutional_summary(score_i, band_review, pep_count, sanc_count, watch_count, adv_count, has_uw)
 
     report_reference = report_reference or (
         f"CIR-RISK-{generated_at.strftime('%Y%m%d')}-{str(getattr(risk, 'id', '')).replace('-', '').upper()[:6]}"
     )
 
-    buf = BytesIO()
     doc = SimpleDocTemplate(
-        buf,
+        out,
         pagesize=A4,
         leftMargin=20 * mm,
         rightMargin=20 * mm,
@@ -689,8 +990,8 @@ def build_risk_pdf_institutional(
     # =========================
     # Página 1 - Síntese executiva
     # =========================
-    story.append(Paragraph("CHECK INSURANCE RISK", H0))
-    story.append(Paragraph("Relatório Institucional de Inteligência de Risco", H1))
+    story.append(_static_para("CHECK INSURANCE RISK", H0))
+    story.append(_static_para("Relatório Institucional de Inteligência de Risco", H1))
     story.append(Spacer(1, 5))
 
     left_html = (
@@ -717,12 +1018,12 @@ def build_risk_pdf_institutional(
 
     kpi_table = [
         ["PEP", "Sanções", "Listas de observação", "Meios adversos", "Histórico segurador", "Fraude"],
-        [str(pep_count), str(sanc_count), str(watch_count), str(adv_count), "SIM" if has_uw else "NÃO", str(fraud_flags_count)],
+        [str(pep_count), str(sanc_count), str(watch_count), str(adv_count), _YN[has_uw], str(fraud_flags_count)],
     ]
     story.append(tbl(kpi_table, col_widths=[20 * mm, 24 * mm, 38 * mm, 31 * mm, 33 * mm, 24 * mm], center=False))
     story.append(Spacer(1, 5))
 
-    story.append(Paragraph("Sumário executivo", H1))
+    story.append(_static_para("Sumário executivo", H1))
     story.append(Paragraph(exec_summary, BODY_CENTER))
     story.append(Spacer(1, 4))
 
@@ -736,6 +1037,7 @@ def build_risk_pdf_institutional(
         info_box(
             "Âmbito da avaliação",
             "A presente avaliação reflecte os dados fornecidos na pesquisa e as fontes actualmente configuradas e activas. A decisão final deve incluir validação humana e documental, nos termos das políticas internas e das exigências regulatórias aplicáveis.",
+            static=True,
         )
     )
     story.append(Spacer(1, 3))
@@ -743,6 +1045,7 @@ def build_risk_pdf_institutional(
         info_box(
             "Confidencialidade",
             "Documento confidencial, destinado exclusivamente a partes autorizadas. A sua divulgação, reprodução ou circulação depende de autorização prévia e expressa.",
+            static=True,
         )
     )
     story.append(PageBreak())
@@ -750,10 +1053,10 @@ def build_risk_pdf_institutional(
     # =========================
     # Página 2 - Compliance
     # =========================
-    story.append(Paragraph("Revisão de compliance", H0))
+    story.append(_static_para("Revisão de compliance", H0))
     story.append(Spacer(1, 3))
     story.append(
-        Paragraph(
+        _static_para(
             "A presente secção apresenta potenciais correspondências em fontes de compliance, organizadas por categoria e por fonte. Todas as correspondências devem ser confirmadas por validação humana antes de qualquer deliberação final.",
             BODY_CENTER,
         )
@@ -761,16 +1064,12 @@ def build_risk_pdf_institutional(
     story.append(Spacer(1, 4))
 
     def _render_category(title: str, by_source: Dict[str, List[dict]]) -> None:
-        story.append(Paragraph(title, H2))
+        story.append(_static_para(title, H2))
         rows = [["Fonte", "N.º de registos", "Pontuação máxima"]]
-        for src, hits in by_source.items():
-            top = 0
-            for h in hits or []:
-                try:
-                    top = max(top, int((h or {}).get("match_score", 0) or 0))
-                except Exception:
-                    pass
-            rows.append([_safe(src, 60), str(len(hits or [])), str(top)])
+        rows += [
+            [_safe(src, 60), str(len(hits or [])), str(_top_match_score(hits))]
+            for src, hits in by_source.items()
+        ]
         story.append(tbl(rows, col_widths=[95 * mm, 35 * mm, 40 * mm], center=False))
         story.append(Spacer(1, 3))
         for src, hits in by_source.items():
@@ -804,10 +1103,10 @@ def build_risk_pdf_institutional(
     # Página 3+ - Histórico segurador
     # =========================
     story.append(PageBreak())
-    story.append(Paragraph("Histórico segurador e inteligência de risco", H0))
+    story.append(_static_para("Histórico segurador e inteligência de risco", H0))
     story.append(Spacer(1, 3))
     story.append(
-        Paragraph(
+        _static_para(
             "A análise abaixo apresenta o histórico agregado por tipo de produto de seguro, com base nos registos actualmente disponíveis.",
             BODY_CENTER,
         )
@@ -819,6 +1118,7 @@ def build_risk_pdf_institutional(
             info_box(
                 "Resultado",
                 "Não existem registos de histórico segurador disponíveis nas fontes actualmente carregadas.",
+                static=True,
             )
         )
     else:
@@ -830,14 +1130,14 @@ def build_risk_pdf_institutional(
     # Página final - Apêndice técnico
     # =========================
     story.append(PageBreak())
-    story.append(Paragraph("Apêndice técnico", H0))
+    story.append(_static_para("Apêndice técnico", H0))
     story.append(Spacer(1, 3))
 
     methodology_text = (
         "A presente avaliação combina fontes de compliance, histórico segurador quando disponível e regras institucionais de decisão. "
         "Os resultados têm natureza indicativa e devem ser confirmados por validação humana, documental e operacional."
     )
-    story.append(info_box("Metodologia", methodology_text))
+    story.append(info_box("Metodologia", methodology_text, static=True))
     story.append(Spacer(1, 5))
 
     story.append(
@@ -845,37 +1145,48 @@ def build_risk_pdf_institutional(
             "Autenticidade e verificação",
             "A validação digital do documento encontra-se disponível através do código QR de verificação. "
             "A autenticidade do relatório pode ser confirmada electronicamente no sistema de validação institucional.",
+            static=True,
         )
     )
     story.append(Spacer(1, 5))
 
-    if qrcode is not None:
-        try:
-            from io import BytesIO as _BIO
+    if not include_qr:
+        if verify_url:
+            from xml.sax.saxutils import escape
 
-            qr_img = qrcode.make(verify_url)
-            qbuf = _BIO()
-            qr_img.save(qbuf, format="PNG")
-            qbuf.seek(0)
+            story.append(Paragraph(f"<b>URL de verificação:</b> {escape(verify_url)}", SMALL_CENTER))
+    elif qr_png is None and not verify_url:
+        story.append(_static_para("Código QR indisponível: URL de verificação não configurado.", SMALL_CENTER))
+    elif qr_png is not None or qrcode is not None:
+        try:
+            if qr_png is not None:
+                qr_flowable = Image(BytesIO(qr_png), width=26 * mm, height=26 * mm)
+            else:
+                qr_flowable = _qr_drawing(verify_url, 26 * mm)
 
-            story.append(Paragraph("Código QR de verificação", H2))
+            story.append(_static_para("Código QR de verificação", H2))
             story.append(Spacer(1, 2))
 
             qr_table = Table(
-                [[Image(qbuf, width=26 * mm, height=26 * mm)]],
+                [[qr_flowable]],
                 colWidths=[170 * mm],
                 hAlign="LEFT",
             )
-            qr_table.setStyle(TableStyle([("ALIGN", (0, 0), (-1, -1), "CENTER")]))
+            qr_table.setStyle(theme.CENTER_STYLE)
             story.append(qr_table)
         except Exception:
-            story.append(Paragraph("Código QR indisponível por erro de geração.", SMALL_CENTER))
+            story.append(_static_para("Código QR indisponível por erro de geração.", SMALL_CENTER))
     else:
-        story.append(Paragraph("Código QR indisponível por ausência da dependência necessária.", SMALL_CENTER))
+        story.append(_static_para("Código QR indisponível por ausência da dependência necessária.", SMALL_CENTER))
 
     doc.build(story, onFirstPage=header_footer, onLaterPages=header_footer)
+
+
+def build_risk_pdf_institutional(*args, **kwargs) -> bytes:
+    buf = BytesIO()
+    write_risk_pdf_institutional(buf, *args, **kwargs)
     return buf.getvalue()
 
 
-def build_risk_pdf_institutional_pt(*args, **kwargs) -> bytes:
-    return build_risk_pdf_institutional(*args, **kwargs)
+# Nome histórico usado pelo router; é o mesmo builder.
+build_risk_pdf_institutional_pt = build_risk_pdf_institutional
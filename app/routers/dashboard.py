@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 
 from app.deps import get_db, require_perm
 from app.models import User, UserRole, Risk, Entity, AuditLog, Source
+from app.services.risk_matches import count_matches_by_category
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
@@ -255,6 +256,28 @@ def dashboard_distribution(
     ]
 
 
+@router.get("/matches")
+def dashboard_matches(
+    db: Session = Depends(get_db),
+    u: User = Depends(require_perm("dashboard:read")),
+    period: Period = Query("30d"),
+    entity_id: Optional[str] = Query(None),
+) -> List[Dict[str, Any]]:
+    """
+    Matches por categoria (PEP/SANCTIONS/WATCHLIST/ADVERSE_MEDIA) no período,
+    agregados no Postgres em vez de percorrer risk.matches em Python.
+    """
+    start = _period_start(period)
+
+    if u.role != UserRole.SUPER_ADMIN:
+        if not getattr(u, "entity_id", None):
+            raise HTTPException(status_code=403, detail="Entity scope missing for this user")
+        entity_id = u.entity_id
+
+    counts = count_matches_by_category(db, entity_id=entity_id, since=start)
+    return [{"category": c, "count": n} for c, n in counts.items()]
+
+
 @router.get("/trends")
 def dashboard_trends(
     db: Session = Depends(get_db),
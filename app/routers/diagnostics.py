@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+import hashlib
+import ssl
+
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from app.db import get_db
 from app.deps import require_perm
+from app.models import UserRole
+from app.settings import settings
 
 router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
 
@@ -65,3 +70,30 @@ def underwriting_diagnostics(entity_id: str, db: Session = Depends(get_db), u=De
             summary = {"error": "insurance_policies exists but missing entity_id/tenant_id or product_type/branch columns"}
 
     return {"entity_id": entity_id, "tables_found": tables, "summary": summary}
+
+
+@router.get("/crypto")
+def crypto_diagnostics(u=Depends(require_perm("admin:dashboard"))):
+    # Confirma em produção que o hashlib usa o OpenSSL (sha256 com SHA-NI quando o CPU tem)
+    # e qual o algoritmo de integridade configurado para os PDFs.
+    # Informação da plataforma (versão OpenSSL, flags do CPU): só SUPER_ADMIN, não o ADMIN de cada tenant.
+    if u.role != UserRole.SUPER_ADMIN:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    cpu_flags: list[str] = []
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("flags"):
+                    cpu_flags = line.split(":", 1)[1].split()
+                    break
+    except OSError:
+        pass
+
+    return {
+        "openssl_version": ssl.OPENSSL_VERSION,
+        "sha256_backend": type(hashlib.sha256()).__module__,
+        "cpu_sha_ni": "sha_ni" in cpu_flags if cpu_flags else None,
+        "pdf_hash_algo": settings.PDF_HASH_ALGO,
+        "algorithms_available": sorted(hashlib.algorithms_available),
+    }
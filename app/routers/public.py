@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.db import get_db
 from app.models import Risk
-from app.pdfs import make_integrity_hash
+from app.pdfs import verify_integrity_hash
 
 
 router = APIRouter(tags=["public"])
@@ -15,9 +15,8 @@ def verify_risk(risk_id: str, hash_value: str, db: Session = Depends(get_db)):
     if not r:
         raise HTTPException(status_code=404, detail="Not found")
 
-    expected = make_integrity_hash(r)
     return {
-        "valid": expected == hash_value,
+        "valid": verify_integrity_hash(r, hash_value),
         "risk_id": r.id,
         "entity_id": r.entity_id,
         "score": r.score,
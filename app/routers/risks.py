@@ -354,10 +354,15 @@ def get_risk_pdf(
         bi=risk.query_bi,
         passport=risk.query_passport,
     )
+    analyst_name = getattr(user, "name", "Analista")
+
+    # O build do PDF é CPU puro (a rota é sync, já corre no threadpool). Tudo o que o PDF usa
+    # já está carregado: fecha a sessão para devolver a conexão ao pool durante o render.
+    db.close()
 
     pdf_bytes = build_risk_pdf_institutional_pt(
         risk=risk,
-        analyst_name=getattr(user, "name", "Analista"),
+        analyst_name=analyst_name,
         generated_at=generated_at,
         integrity_hash=integrity_hash,
         server_signature=server_signature,
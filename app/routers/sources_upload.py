@@ -1,14 +1,12 @@
 from __future__ import annotations
 
-from datetime import datetime
-
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from sqlalchemy.orm import Session
 
 from app.db import get_db
 from app.deps import ensure_entity_scope, require_perm
 from app.models import Source
-from app.models_source_records import SourceRecord
+from app.models_source_records import SourceRecord, bulk_insert_source_records
 from app.services.source_parser_official import parse_official
 
 router = APIRouter(tags=["sources"])
@@ -96,7 +94,7 @@ def upload_source_file(
                 .limit(500)
                 .all()
             )
-            now = datetime.utcnow()
+            records = []
 
             for row in rows or []:
                 subj = (getattr(row, "subject_full_name", None) or "").lower().strip()
@@ -105,14 +103,14 @@ def upload_source_file(
 
                 inserted_policy_names.add(subj)
 
-                db.add(
-                    SourceRecord(
-                        entity_id=str(entity_id),
-                        source_id=str(src.id),
-                        category="INSURANCE",
-                        subject_name=subj,
-                        country=None,
-                        raw={
+                records.append(
+                    {
+                        "entity_id": str(entity_id),
+                        "source_id": str(src.id),
+                        "category": "INSURANCE",
+                        "subject_name": subj,
+                        "country": None,
+                        "raw": {
                             "full_name": _safe_json_value(getattr(row, "subject_full_name", None)),
                             "id_number": _safe_json_value(
                                 getattr(row, "subject_bi", None)
@@ -130,10 +128,11 @@ def upload_source_file(
                             "product_type": _safe_json_value(getattr(row, "product_type", None)),
                             "policy_number": _safe_json_value(getattr(row, "policy_number", None)),
                         },
-                        created_at=now,
-                    )
+                    }
                 )
 
+            bulk_insert_source_records(db, records)
+
             src.status = "ACTIVE"
             db.add(src)
             db.commit()
@@ -164,7 +163,7 @@ def upload_source_file(
         SourceRecord.source_id == str(src.id)
     ).delete(synchronize_session=False)
 
-    now = datetime.utcnow()
+    records = []
 
     for r in valid:
         if category in ("PEP", "SANCTIONS"):
@@ -174,18 +173,20 @@ def upload_source_file(
         else:
             subject = (r.get("entity_name") or "").lower().strip()
 
-        db.add(
-            SourceRecord(
-                entity_id=str(entity_id),
-                source_id=str(src.id),
-                category=category,
-                subject_name=subject,
-                country=r.get("country"),
-                raw=r,
-                created_at=now,
-            )
+        records.append(
+            {
+                "entity_id": str(entity_id),
+                "source_id": str(src.id),
+                "category": category,
+                "subject_name": subject,
+                "country": r.get("country"),
+                "raw": r,
+            }
         )
 
+    # Insert em lote (multi-VALUES): listas oficiais podem ter dezenas de milhares de linhas.
+    bulk_insert_source_records(db, records)
+
     src.status = "ACTIVE"
     db.add(src)
     db.commit()
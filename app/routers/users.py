@@ -1,7 +1,7 @@
 # app/routers/users.py
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.db import get_db
 from app.deps import require_perm
@@ -23,7 +23,8 @@ def _scope_query(q, current: User):
 
 @router.get("", response_model=list[UserOut])
 def list_users(db: Session = Depends(get_db), u=Depends(require_perm("users:read"))):
-    q = _scope_query(db.query(User), u)
+    # selectinload: as entidades vêm num único SELECT ... IN (...) em vez de 1 query por utilizador.
+    q = _scope_query(db.query(User).options(selectinload(User.entity)), u)
     users = q.order_by(User.name.asc()).all()
 
     out = []
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import case, cast, func, literal, select, true
+from sqlalchemy.dialects.postgresql import JSON as PG_JSON
+from sqlalchemy.orm import Session
+
+from app.models import Risk
+
+
+def _match_elements():
+    """
+    json_array_elements(risks.matches) como LATERAL (uma linha por match).
+    risks.matches é JSON (não JSONB); valores que não sejam array contam como lista vazia
+    em vez de rebentar a query.
+    """
+    arr = case(
+        (func.json_typeof(Risk.matches) == "array", Risk.matches),
+        else_=cast(literal("[]"), PG_JSON),
+    )
+    return func.json_array_elements(arr).table_valued("value").lateral("m")
+
+
+# Categorias canónicas do PDF (_normalize_matches_generic); tudo o resto conta como WATCHLIST.
+_MATCH_CATEGORIES = ("PEP", "SANCTIONS", "WATCHLIST", "ADVERSE_MEDIA")
+
+
+def count_matches_by_category(
+    db: Session,
+    *,
+    entity_id: Optional[str],
+    since: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """
+    Contagem de matches por categoria, agregada na DB, com a mesma regra do PDF:
+    primeira chave não vazia entre category -> type -> list_type (como o `or` em Python),
+    normalizada com upper/trim; valores fora das categorias canónicas (ou ausentes) -> WATCHLIST.
+    entity_id=None conta todas as entidades (só para SUPER_ADMIN).
+    """
+    m = _match_elements()
+    raw_cat = func.coalesce(
+        func.nullif(m.c.value.op("->>")("category"), ""),
+        func.nullif(m.c.value.op("->>")("type"), ""),
+        func.nullif(m.c.value.op("->>")("list_type"), ""),
+    )
+    norm = func.upper(func.trim(raw_cat))
+    cat = case((norm.in_(_MATCH_CATEGORIES), norm), else_="WATCHLIST").label("category")
+
+    stmt = select(cat, func.count()).select_from(Risk).join(m, true()).group_by(cat)
+    if entity_id is not None:
+        stmt = stmt.where(Risk.entity_id == entity_id)
+    if since is not None:
+        stmt = stmt.where(Risk.created_at >= since)
+
+    out = dict.fromkeys(_MATCH_CATEGORIES, 0)
+    for c, n in db.execute(stmt):
+        out[str(c)] = int(n)
+    return out
@@ -5,8 +5,6 @@ import io
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 
-import openpyxl
-
 
 REQUIRED = {
     "PEP": ["full_name", "role", "country", "pep_level", "source"],
@@ -51,6 +49,10 @@ def _read_csv(file_bytes: bytes) -> List[Dict[str, Any]]:
 
 
 def _read_xlsx(file_bytes: bytes) -> List[Dict[str, Any]]:
+    # Import lazy (~175 ms e vários MB): este módulo é importado no arranque via router de upload,
+    # mas só os uploads .xlsx precisam do openpyxl.
+    import openpyxl
+
     wb = openpyxl.load_workbook(io.BytesIO(file_bytes), data_only=True)
     ws = wb.active
     rows = list(ws.iter_rows(values_only=True))
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
@@ -5,6 +7,7 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
     APP_NAME: str = "Check Insurance Risk API"
+    DEBUG: bool = False
 
     DATABASE_URL: str
 
@@ -19,6 +22,7 @@ class Settings(BaseSettings):
     # PDF / Verification
     PDF_SECRET_KEY: str = "CHANGE_ME"  # override via Render env vars
     BASE_URL: str = "http://localhost:8000"  # public base URL for QR verification
+    PDF_HASH_ALGO: Literal["sha256", "blake2b", "blake3"] = "sha256"  # hash prefix: none | "b2:" | "b3:"; old hashes still verify
 
     CORS_ORIGINS: str = "http://localhost:5173,https://checkinsurancerisk.com,https://www.checkinsurancerisk.com"
 
@@ -24,16 +24,24 @@ ESCALATE_TRIGGERS = {
 
 
 def _safe_int(v: Any, default: int = 0) -> int:
+    if type(v) is int:
+        return v
+    if v is None:
+        return default
     try:
         return int(v)
-    except Exception:
+    except (TypeError, ValueError, OverflowError):
         return default
 
 
 def _safe_float(v: Any, default: float = 0.0) -> float:
+    if type(v) is float:
+        return v
+    if v is None:
+        return default
     try:
         return float(v)
-    except Exception:
+    except (TypeError, ValueError, OverflowError):
         return default
 
 
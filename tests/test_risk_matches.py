@@ -0,0 +1,63 @@
+from datetime import datetime
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.risk_matches import count_matches_by_category
+
+
+class _FakeSession:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.stmt = None
+
+    def execute(self, stmt):
+        self.stmt = stmt
+        return self.rows
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_non_array_matches_are_guarded():
+    db = _FakeSession()
+    count_matches_by_category(db, entity_id="e1")
+    sql = _sql(db.stmt)
+    assert "json_typeof(risks.matches) = 'array'" in sql
+    assert "CAST('[]' AS JSON)" in sql
+    assert "JOIN LATERAL json_array_elements(" in sql
+
+
+def test_category_mapping_follows_pdf_normaliser():
+    db = _FakeSession()
+    count_matches_by_category(db, entity_id="e1")
+    sql = _sql(db.stmt)
+    # Chaves vazias saltam para a seguinte (como o `or` em Python), antes do upper/trim.
+    assert (
+        "upper(trim(coalesce(nullif(m.value ->> 'category', ''), "
+        "nullif(m.value ->> 'type', ''), nullif(m.value ->> 'list_type', ''))))"
+    ) in sql
+    assert "IN ('PEP', 'SANCTIONS', 'WATCHLIST', 'ADVERSE_MEDIA')" in sql
+    assert "ELSE 'WATCHLIST' END" in sql
+
+
+def test_scope_filters():
+    db = _FakeSession()
+    count_matches_by_category(db, entity_id="e1", since=datetime(2026, 1, 1))
+    sql = _sql(db.stmt)
+    assert "risks.entity_id = 'e1'" in sql
+    assert "risks.created_at >= '2026-01-01 00:00:00'" in sql
+
+    db = _FakeSession()
+    count_matches_by_category(db, entity_id=None)
+    assert "risks.entity_id" not in _sql(db.stmt)
+
+
+def test_all_categories_present_in_result():
+    db = _FakeSession([("SANCTIONS", 3), ("WATCHLIST", 1)])
+    assert count_matches_by_category(db, entity_id="e1") == {
+        "PEP": 0,
+        "SANCTIONS": 3,
+        "WATCHLIST": 1,
+        "ADVERSE_MEDIA": 0,
+    }